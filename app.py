@@ -1,40 +1,156 @@
-from flask import Flask, json, request, jsonify
+from flask import Flask, request, jsonify, g
 from flask_cors import CORS
+from flask_caching import Cache
+import numpy as np
 import pandas as pd
-import requests
-from datetime import datetime, timedelta
+import orjson
+import msgpack
+import aiohttp
+import asyncio
+import calendar
+import zlib
+import diskcache
+import hashlib
+import time
+from email.utils import parsedate_to_datetime
+from werkzeug.exceptions import HTTPException, BadRequest, RequestEntityTooLarge, UnsupportedMediaType
+from datetime import datetime, timedelta, timezone
 
 app = Flask(__name__)
 CORS(app)  # ✅ Enable CORS globally
+# POST bodies are capped before (MAX_CONTENT_LENGTH) and after gzip decoding
+app.config['MAX_CONTENT_LENGTH'] = 8 * 1024 * 1024
+MAX_DECOMPRESSED_SIZE = 32 * 1024 * 1024
+# 💾 In-process cache of endpoint results (1 hour)
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 3600})
+
+# NASA POWER client settings (shared by every year fetch)
+NASA_HEADERS = {'Accept': 'application/json'}
+# No total: time spent queued for one of the pooled connections must not
+# count against a request, so each request gets its own connect/read budget
+NASA_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=3.05, sock_read=15)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.3
+# Overall budget for one fetch_data call across all years, retries included,
+# well inside gunicorn's 300s worker timeout; years still pending are dropped
+FETCH_DEADLINE = 120
+
+# 💾 On-disk cache of raw NASA POWER responses, shared by all workers
+NASA_CACHE_DIR = '/tmp/nasa_power'
+nasa_cache = diskcache.Cache(NASA_CACHE_DIR, eviction_policy='least-recently-used')
+# Bodies still holding -999 fill values may be backfilled upstream later
+FILL_VALUE_EXPIRE = 30 * 24 * 3600
+
+
+def retry_after_seconds(value):
+    # Retry-After is either a number of seconds or an HTTP date
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def has_fill_values(data):
+    return any(
+        v == -999.00
+        for series in data['properties']['parameter'].values()
+        for v in series.values()
+    )
 
 # -----------------------------
-# Fetch Data Function (timeout-safe)
+# Parse one year of NASA POWER data
+# -----------------------------
+def parse_year(data, parameters, dropna=True):
+    lon_, lat_, elev_ = data['geometry']['coordinates']
+    params = data['properties']['parameter']
+    date_keys = list(params[parameters[0]])
+    n = len(date_keys)
+    dates = np.array(date_keys)
+
+    rows = []
+    for p in parameters:
+        series = params.get(p, {})
+        if len(series) == n:
+            # ⚡ NASA returns every parameter over the same dates in the same
+            # order, so the values are read straight off the dict
+            rows.append(np.fromiter(series.values(), dtype=np.float32, count=n))
+        else:
+            rows.append(np.fromiter(
+                (series.get(d, -999.00) for d in date_keys),
+                dtype=np.float32, count=n
+            ))
+    arrs = np.stack(rows)
+
+    # ⚡ Flag NASA's -999 fill value for all parameters in one vectorized pass
+    missing = arrs == -999.00
+    if dropna:
+        valid = ~missing.any(axis=0)
+        dates, arrs = dates[valid], arrs[:, valid]
+    else:
+        arrs[missing] = np.nan
+
+    return (lon_, lat_, elev_), dates, arrs
+
+# -----------------------------
+# Days fetched around the target date
 # -----------------------------
-def fetch_data(lat, lon, target_date, start_year, end_year, parameters, window=5):
+def date_window(target_date, window):
     try:
         target_dt = datetime.strptime(target_date, "%Y-%m-%d")
     except ValueError:
         raise ValueError("Invalid date format. Expected YYYY-MM-DD")
+    return target_dt, target_dt - timedelta(days=window), target_dt + timedelta(days=window)
 
-    if window:
-        date_start = target_dt - timedelta(days=window)
-        date_end = target_dt + timedelta(days=window)
-    else:
-        date_start = target_dt
-        date_end = target_dt
 
-    month_start, day_start = date_start.month, date_start.day
-    month_end, day_end = date_end.month, date_end.day
-
-    all_records = []
+# -----------------------------
+# Fetch Data Function (timeout-safe)
+# -----------------------------
+def fetch_data(lat, lon, target_date, start_year, end_year, parameters, window=5, dropna=True):
+    target_dt, date_start, date_end = date_window(target_date, window)
+
+    # Only the year changes from one request to the next, so the MMDD parts
+    # are formatted once up front. Each edge keeps its year offset from the
+    # target, so a window that wraps past New Year runs from December of one
+    # year into January of the next.
+    mmdd_start = f"{date_start.month:02d}{date_start.day:02d}"
+    mmdd_end = f"{date_end.month:02d}{date_end.day:02d}"
+    start_shift = date_start.year - target_dt.year
+    end_shift = date_end.year - target_dt.year
+    # Only a single-day fetch of Feb 29 has nothing to return in non-leap years
+    feb29_only = not window and (target_dt.month, target_dt.day) == (2, 29)
+
+    def _skipped(year):
+        return feb29_only and not calendar.isleap(year)
+
+    def _edge(year, mmdd):
+        # A window edge on Feb 29 becomes Feb 28 in non-leap years, so those
+        # years keep the rest of their window
+        if mmdd == '0229' and not calendar.isleap(year):
+            return f"{year}0228"
+        return f"{year}{mmdd}"
+
+    # Output columns (structure-of-arrays), one array chunk per year
+    lon_out, lat_out, elev_out, dates_out = [], [], [], []
+    vals = {p: [] for p in parameters}
     param_str = ",".join(parameters)
+    years = list(range(start_year, end_year + 1))
+    current_year = datetime.now().year
 
-    for year in range(start_year, end_year + 1):
-        try:
-            start_range = datetime(year, month_start, day_start).strftime('%Y%m%d')
-            end_range = datetime(year, month_end, day_end).strftime('%Y%m%d')
-        except ValueError:
-            continue  # skip invalid dates (Feb 29 on non-leap years)
+    async def _fetch_year(session, year):
+        if _skipped(year):
+            return None  # skip invalid dates (Feb 29 on non-leap years)
+        start_range = _edge(year + start_shift, mmdd_start)
+        end_range = _edge(year + end_shift, mmdd_end)
 
         url = (
             f"https://power.larc.nasa.gov/api/temporal/daily/point"
@@ -44,64 +160,130 @@ def fetch_data(lat, lon, target_date, start_year, end_year, parameters, window=5
             f"&format=JSON&units=metric&header=true&time-standard=utc"
         )
 
+        # Complete past years never change upstream, so they are cached
+        # indefinitely; ones with fill values expire so gaps get refetched,
+        # and the current year is still being filled in and always goes to NASA.
+        cache_key = (lat, lon, start_range, end_range, param_str)
+        cacheable = year + end_shift < current_year
+        if cacheable:
+            body = nasa_cache.get(cache_key)
+            if body is not None:
+                return orjson.loads(body)
+
+        for attempt in range(MAX_RETRIES + 1):
+            can_retry = attempt < MAX_RETRIES
+            retry_after = None
+            try:
+                async with session.get(url) as response:
+                    if response.status in RETRY_STATUSES and can_retry:
+                        retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+                    else:
+                        response.raise_for_status()
+                        body = await response.read()
+                        data = orjson.loads(body)
+                        if cacheable:
+                            expire = FILL_VALUE_EXPIRE if has_fill_values(data) else None
+                            nasa_cache.set(cache_key, body, expire=expire)
+                        return data
+                # Retryable status: leave the block first so the connection
+                # goes back to the pool before backing off
+            except asyncio.TimeoutError:
+                if not can_retry:
+                    print(f"[WARNING] Timeout for year {year}, skipping...")
+                    return None
+            except aiohttp.ClientConnectionError as e:
+                if not can_retry:
+                    print(f"[ERROR] Request failed for year {year}: {e}")
+                    return None
+            except aiohttp.ClientError as e:
+                print(f"[ERROR] Request failed for year {year}: {e}")
+                return None
+            except ValueError:
+                print(f"[ERROR] JSON decode failed for year {year}")
+                return None
+
+            # Honour the server's Retry-After (as urllib3's Retry does),
+            # unless it would run past the fetch deadline
+            delay = BACKOFF_FACTOR * (2 ** attempt) if retry_after is None else retry_after
+            if time.monotonic() + delay > deadline:
+                print(f"[WARNING] No time left to retry year {year}, skipping...")
+                return None
+            await asyncio.sleep(delay)
+        return None
+
+    async def _fetch_and_parse(session, year):
+        data = await _fetch_year(session, year)
+        if data is None:
+            return None
+        # ⚡ Parsed as soon as it arrives, while the other years are still in flight
         try:
-            # ⚡ Timeout set to 15 seconds
-            response = requests.get(url, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-        except requests.exceptions.Timeout:
-            print(f"[WARNING] Timeout for year {year}, skipping...")
-            continue
-        except requests.exceptions.RequestException as e:
-            print(f"[ERROR] Request failed for year {year}: {e}")
-            continue
-        except ValueError:
-            print(f"[ERROR] JSON decode failed for year {year}")
-            continue
-
-        # Parse the data safely
-        try:
-            lon_, lat_, elev_ = data['geometry']['coordinates']
-            params = data['properties']['parameter']
-            dates = list(params[parameters[0]].keys())
-
-            for d in dates:
-                record = {
-                    'Longitude': lon_,
-                    'Latitude': lat_,
-                    'Elevation': elev_,
-                    'Date': pd.to_datetime(d, format='%Y%m%d')
-                }
-                missing = False
-                for p in parameters:
-                    val = params.get(p, {}).get(d, -999.00)
-                    record[p] = val
-                    if val == -999.00:
-                        missing = True
-                if not missing:
-                    all_records.append(record)
+            return parse_year(data, parameters, dropna)
         except Exception as e:
             print(f"[ERROR] Failed to parse data for year {year}: {e}")
+            return None
+
+    async def _gather_all():
+        # ⚡ All years are fetched concurrently over one keep-alive session
+        # ⚡ Timeout: 3.05s to connect, 15s per read, not counting pool queueing
+        connector = aiohttp.TCPConnector(limit_per_host=8)
+        async with aiohttp.ClientSession(
+            connector=connector, headers=NASA_HEADERS, timeout=NASA_TIMEOUT
+        ) as session:
+            tasks = [asyncio.ensure_future(_fetch_and_parse(session, y)) for y in years]
+            # Years still queued or retrying at the deadline are cancelled
+            # and reported as failed; the finished ones are kept
+            _, pending = await asyncio.wait(tasks, timeout=deadline - time.monotonic())
+            for task in pending:
+                task.cancel()
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+    deadline = time.monotonic() + FETCH_DEADLINE
+    results = asyncio.run(_gather_all())
+
+    # Years that timed out, errored or failed to parse (Feb 29 skips on
+    # non-leap years are expected and don't count)
+    failed_years = []
+    for year, parsed in zip(years, results):
+        if isinstance(parsed, asyncio.CancelledError):
+            print(f"[WARNING] Fetch deadline reached for year {year}, skipping...")
+            parsed = None
+        elif isinstance(parsed, Exception):
+            print(f"[ERROR] Request failed for year {year}: {parsed}")
+            parsed = None
+        if parsed is None:
+            if not _skipped(year):
+                failed_years.append(year)
             continue
 
-    df = pd.DataFrame(all_records)
+        (lon_, lat_, elev_), dates, arrs = parsed
+        n = len(dates)
+        lon_out.append(np.full(n, lon_))
+        lat_out.append(np.full(n, lat_))
+        elev_out.append(np.full(n, elev_))
+        dates_out.append(dates)
+        for p, arr in zip(parameters, arrs):
+            vals[p].append(arr)
+
+    if not dates_out:
+        raise ValueError("No valid data returned from NASA POWER API.")
+
+    # ⚡ Build the DataFrame column-wise: one array per column, no per-row dicts
+    df = pd.DataFrame({
+        'Longitude': np.concatenate(lon_out),
+        'Latitude': np.concatenate(lat_out),
+        'Elevation': np.concatenate(elev_out),
+        # Every date string is unique (each year contributes its own), so
+        # to_datetime's memoization cache would only add hashing overhead
+        'Date': pd.to_datetime(np.concatenate(dates_out), format='%Y%m%d', cache=False),
+        **{p: np.concatenate(vals[p]) for p in parameters}
+    })
     if df.empty:
         raise ValueError("No valid data returned from NASA POWER API.")
+    df.attrs['failed_years'] = failed_years
     return df
 
 def fetch_params(lat, lon, target_date, start_year, end_year, parameters, window=5):
-    try:
-        target_dt = datetime.strptime(target_date, "%Y-%m-%d")
-    except ValueError:
-        raise ValueError("Invalid date format. Expected YYYY-MM-DD")
-
-    if window:
-        date_start = target_dt - timedelta(days=window)
-        date_end = target_dt + timedelta(days=window)
-    else:
-        date_start = target_dt
-        date_end = target_dt
-
+    _, date_start, date_end = date_window(target_date, window)
     month_start, day_start = date_start.month, date_start.day
     month_end, day_end = date_end.month, date_end.day
 
@@ -119,6 +301,30 @@ def fetch_params(lat, lon, target_date, start_year, end_year, parameters, window
     return df
 
 
+# ---------------------------------------------------
+# Shared all-parameter fetch
+# ---------------------------------------------------
+# ⚡ /api/all and /api/timeseries both read from one cached fetch of all six
+# parameters over the default +/-5 day window, so a burst of calls for the
+# same place and date costs a single round of NASA requests. Missing values
+# are kept as NaN; each caller drops them for the parameters it uses.
+# A fetch that lost any year is returned but not memoized.
+BUNDLE_WINDOW = 5
+
+def is_complete(df):
+    return not df.attrs.get('failed_years')
+
+@cache.memoize(response_filter=is_complete)
+def fetch_bundle(lat, lon, target_date, start_year, end_year):
+    return fetch_data(lat, lon, target_date, start_year, end_year, ALL_PARAMS,
+                      window=BUNDLE_WINDOW, dropna=False)
+
+def bundle_covers(parameters):
+    # The bundle holds every year's full window, so any subset of its
+    # parameters can be sliced out of it for any target day
+    return set(parameters) <= set(ALL_PARAMS)
+
+
 def get_request_params():
     validate_request_params('lat', 'long', 'date')
     lat = float(request.args['lat'])
@@ -128,9 +334,44 @@ def get_request_params():
     end_year = int(request.args.get('end_year', 2025))
     return lat, lon, target_date, start_year, end_year
 
-def end_response(categories_fun, params):
-    # Get JSON data from POST body
-    data = request.get_json()
+def read_post_body():
+    # ⚡ Clients may send api_result as msgpack (Content-Type: application/msgpack),
+    # which is smaller and faster to decode than JSON; either format may be
+    # gzip-compressed (Content-Encoding: gzip)
+    body = request.get_data()
+    if request.content_encoding == 'gzip':
+        # Decoded with a size cap so a small gzip bomb can't exhaust memory
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            body = decoder.decompress(body, MAX_DECOMPRESSED_SIZE)
+        except zlib.error:
+            raise BadRequest("Invalid gzip request body")
+        if decoder.unconsumed_tail:
+            raise RequestEntityTooLarge("Decompressed request body is too large")
+        if not decoder.eof:
+            raise BadRequest("Truncated gzip request body")
+    if request.mimetype == 'application/msgpack':
+        return msgpack.unpackb(body, raw=False)
+    return orjson.loads(body)
+
+def check_post_type():
+    if request.mimetype != 'application/msgpack' and not request.is_json:
+        raise UnsupportedMediaType("Expected an application/json or application/msgpack request body")
+
+def end_response(params):
+    # Size and type errors keep their own status codes (413/415/400)
+    try:
+        check_post_type()
+        # ⚡ Identical POST bodies are answered straight from the cache
+        cache_key = f"{request.path}:{hashlib.blake2b(request.get_data()).hexdigest()}"
+        probs = cache.get(cache_key)
+        if probs is not None:
+            return orjson_response(probs)
+
+        # Get data from POST body
+        data = read_post_body()
+    except HTTPException as e:
+        return jsonify({"error": e.description}), e.code
     if not data or 'api_result' not in data:
         return jsonify({"error": "Missing 'api_result' in request body"}), 400
 
@@ -138,86 +379,102 @@ def end_response(categories_fun, params):
     df_json = data['api_result']
     if isinstance(df_json, str):
         # Handle case where it's a JSON string
-        df_json = json.loads(df_json)
+        df_json = orjson.loads(df_json)
+
+    # ⚡ Pull out just the one column we classify; no DataFrame needed
+    if isinstance(df_json, dict):
+        # Column-oriented payload: {param: [...]} or {param: {index: value}}
+        values = df_json[params]
+        if isinstance(values, dict):
+            values = list(values.values())
+    else:
+        # Record-oriented payload: [{param: value, ...}, ...]
+        values = [row[params] for row in df_json]
+    if not len(values):
+        return jsonify({"error": f"No '{params}' values in 'api_result'"}), 400
+
+    probs = category_probabilities(params, np.asarray(values, dtype=np.float32))
+    cache.set(cache_key, probs)
 
-    # Convert to DataFrame
-    df = pd.DataFrame(df_json)
+    # Return result as JSON
+    return orjson_response(probs)
 
-    # Apply category function
-    df['Category'] = df[params].apply(categories_fun)
+def category_probabilities(param, values):
+    # Categorize the whole column at once (typed float32 input keeps the
+    # comparisons on NumPy's native path even for object columns, and
+    # matches the float32 thresholds so nothing is upcast)
+    codes = categorize(param, np.asarray(values, dtype=np.float32))
 
-    # Calculate probabilities
-    probs = df['Category'].value_counts(normalize=True) * 100
+    # ⚡ Calculate probabilities from a dense histogram of the integer codes
+    # (no hashing, unlike value_counts), then attach labels
+    labels = CATEGORY_LABELS[param].tolist()
+    counts = np.bincount(codes, minlength=len(labels)).tolist()
+    total = sum(counts)
+    return {label: count / total * 100 for label, count in zip(labels, counts) if count}
 
-    # Return result as JSON
-    return jsonify(probs.to_dict())
 # ---------------------------------------------------
 # Categorization Functions
 # ---------------------------------------------------
-def categorize_aod(aod):
-    if aod < 0.15:
-        return "Clean"
-    elif 0.15 <= aod < 0.40:
-        return "Moderate"
-    elif 0.40 <= aod < 0.80:
-        return "Heavily Polluted"
-    else:
-        return "Extremely Polluted"
-
-def categorize_cloud(ca):
-    if ca < 30:
-        return "Sunny"
-    elif ca > 70:
-        return "Cloudy"
-    else:
-        return "Partly Cloudy"
-
-def categorize_temp(t_celsius):
-    if t_celsius <= -10:
-        return "Extremely Cold (<= -10°C)"
-    elif -10 < t_celsius <= 0:
-        return "Very Cold (-10°C to 0°C)"
-    elif 0 < t_celsius <= 10:
-        return "Cold (0°C to 10°C)"
-    elif 10 < t_celsius <= 20:
-        return "Mild (10°C to 20°C)"
-    elif 20 < t_celsius <= 35:
-        return "Warm (20°C to 35°C)"
-    elif 35 < t_celsius <= 45:
-        return "Hot (35°C to 45°C)"
-    else:
-        return "Extremely Hot (> 45°C)"
-
-def categorize_snow(s):
-    if s == 0:
-        return 'No Snow'
-    elif s < 1:
-        return 'Light Snow'
-    elif s < 5:
-        return 'Moderate Snow'
-    else:
-        return 'Heavy Snow'
-
-def categorize_rainfall(x):
-    if x == 0:
-        return 'No Rain'
-    elif x < 5:
-        return 'Light Rain'
-    elif x < 20:
-        return 'Moderate Rain'
-    else:
-        return 'Heavy Rain'
-
-def categorize_wind(ws):
-    if ws < 2:
-        return 'Calm'
-    elif ws < 5:
-        return 'Light Breeze'
-    elif ws < 10:
-        return 'Moderate Breeze'
-    else:
-        return 'Strong Wind'
-
+# Each category ladder is a sorted array of thresholds keyed by NASA parameter:
+# categorize() maps a whole column to integer label codes in vectorized passes,
+# and labels are only looked up once the codes have been counted. The arrays are
+# built once here and shared read-only by every request.
+# A value equal to a threshold goes to the upper bucket, except for params in
+# UPPER_INCLUSIVE_PARAMS, whose ranges keep it in the lower one.
+# Values and thresholds are both float32, so a value written exactly at a
+# threshold (0.15, 0.40, ...) rounds the same way and lands in the same bucket.
+ALL_PARAMS = ['AOD_55_ADJ', 'CLOUD_AMT', 'T2M', 'SNODP', 'PRECTOTCORR', 'WS10M']
+
+CATEGORY_BINS = {
+    'AOD_55_ADJ': np.array([0.15, 0.40, 0.80], dtype=np.float32),
+    # exactly 70 is still Partly Cloudy
+    'CLOUD_AMT': np.array([30, np.nextafter(np.float32(70), np.float32(np.inf))], dtype=np.float32),
+    'T2M': np.array([-10, 0, 10, 20, 35, 45], dtype=np.float32),
+    'SNODP': np.array([1, 5], dtype=np.float32),
+    'PRECTOTCORR': np.array([5, 20], dtype=np.float32),
+    'WS10M': np.array([2, 5, 10], dtype=np.float32),
+}
+CATEGORY_LABELS = {
+    'AOD_55_ADJ': np.array(["Clean", "Moderate", "Heavily Polluted", "Extremely Polluted"]),
+    'CLOUD_AMT': np.array(["Sunny", "Partly Cloudy", "Cloudy"]),
+    'T2M': np.array([
+        "Extremely Cold (<= -10°C)",
+        "Very Cold (-10°C to 0°C)",
+        "Cold (0°C to 10°C)",
+        "Mild (10°C to 20°C)",
+        "Warm (20°C to 35°C)",
+        "Hot (35°C to 45°C)",
+        "Extremely Hot (> 45°C)",
+    ]),
+    'SNODP': np.array(['No Snow', 'Light Snow', 'Moderate Snow', 'Heavy Snow']),
+    'PRECTOTCORR': np.array(['No Rain', 'Light Rain', 'Moderate Rain', 'Heavy Rain']),
+    'WS10M': np.array(['Calm', 'Light Breeze', 'Moderate Breeze', 'Strong Wind']),
+}
+# Temperature ranges include their upper bound
+UPPER_INCLUSIVE_PARAMS = {'T2M'}
+# Snow and rain give an exact 0 its own label; every other value (anything
+# below the first threshold included) is laddered from label 1 onwards.
+ZERO_CATEGORY_PARAMS = {'SNODP', 'PRECTOTCORR'}
+# The cloud ladder only tested < 30 and > 70, so a missing value (NaN) fell
+# through to its middle branch, Partly Cloudy
+NAN_CATEGORY = {'CLOUD_AMT': 1}
+
+def categorize(param, values):
+    # ⚡ Branchless: every threshold a value has passed adds one to its code,
+    # one SIMD comparison pass per threshold instead of a binary search per
+    # value.
+    # Written as "not below" so NaN lands in the top bucket, which is where
+    # the final else of most of the old if/elif ladders put it; params whose
+    # ladder sent NaN elsewhere are remapped via NAN_CATEGORY.
+    below = np.less_equal if param in UPPER_INCLUSIVE_PARAMS else np.less
+    codes = np.zeros(values.shape, dtype=np.int8)
+    for threshold in CATEGORY_BINS[param]:
+        codes += ~below(values, threshold)
+    if param in ZERO_CATEGORY_PARAMS:
+        codes = np.where(values == 0, 0, codes + 1)
+    if param in NAN_CATEGORY:
+        codes = np.where(np.isnan(values), NAN_CATEGORY[param], codes)
+    return codes
 
 # ---------------------------------------------------
 # Utility: Validate required parameters
@@ -228,6 +485,55 @@ def validate_request_params(*params):
         raise ValueError(f"Missing required query parameters: {', '.join(missing)}")
 
 
+# ---------------------------------------------------
+# Utility: Only cache successful responses
+# ---------------------------------------------------
+def is_success(response):
+    # Error views return (response, status) tuples; those are never cached,
+    # and neither are responses built from a fetch that lost some years
+    return getattr(response, 'status_code', None) == 200 and not g.get('incomplete_fetch')
+
+def note_incomplete(df):
+    if not is_complete(df):
+        g.incomplete_fetch = True
+    return df
+
+
+# ---------------------------------------------------
+# Utility: Fast JSON responses
+# ---------------------------------------------------
+def orjson_response(payload, status=200):
+    # orjson serializes NumPy scalars/arrays natively and is much faster than jsonify
+    return app.response_class(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype='application/json'
+    )
+
+
+WEEKDAY_NAMES = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+MONTH_NAMES = ['', 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+def http_dates(dates):
+    # Same RFC 1123 format jsonify produced for Timestamps. NASA daily dates
+    # are always midnight, so only the calendar fields need formatting
+    return [
+        f"{WEEKDAY_NAMES[w]}, {d:02d} {MONTH_NAMES[m]} {y} 00:00:00 GMT"
+        for w, d, m, y in zip(
+            dates.dt.weekday.tolist(), dates.dt.day.tolist(),
+            dates.dt.month.tolist(), dates.dt.year.tolist()
+        )
+    ]
+
+def records_response(df):
+    # orient='records' JSON without DataFrame.to_dict: rows keep NumPy scalars
+    # so orjson writes float32 values at float32 precision (0.15, not the
+    # 0.150000006 that to_dict or DataFrame.to_json would produce)
+    columns = list(df.columns)
+    arrays = [http_dates(df[c]) if c == 'Date' else df[c].to_numpy() for c in columns]
+    return orjson_response([dict(zip(columns, row)) for row in zip(*arrays)])
+
+
 # ---------------------------------------------------
 # API Endpoints
 # ---------------------------------------------------
@@ -244,7 +550,7 @@ def api_aod():
 @app.route('/api/aod_after_res', methods=['POST'])
 def api_aod_after_res():
     try:
-        return end_response(categorize_aod, 'AOD_55_ADJ')
+        return end_response('AOD_55_ADJ')
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
@@ -260,7 +566,7 @@ def api_cloud():
 @app.route('/api/cloud_after_res', methods=['POST'])
 def api_cloud_after_res():
     try:
-        return end_response(categorize_cloud, 'CLOUD_AMT')
+        return end_response('CLOUD_AMT')
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
@@ -277,7 +583,7 @@ def api_temp():
 @app.route('/api/temp_after_res', methods=['POST'])
 def api_temp_after_res():
     try:
-        return end_response(categorize_temp, 'T2M')
+        return end_response('T2M')
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
@@ -294,7 +600,7 @@ def api_snow():
 @app.route('/api/snow_after_res', methods=['POST'])
 def api_snow_after_res():
     try:
-        return end_response(categorize_snow, 'SNODP')
+        return end_response('SNODP')
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
@@ -310,7 +616,7 @@ def api_rain():
 @app.route('/api/rain_after_res', methods=['POST'])
 def api_rain_after_res():
     try:
-        return end_response(categorize_rainfall, 'PRECTOTCORR')
+        return end_response('PRECTOTCORR')
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
@@ -327,13 +633,30 @@ def api_wind():
 @app.route('/api/wind_after_res', methods=['POST'])
 def api_wind_after_res():
     try:
-        return end_response(categorize_wind, 'WS10M')
+        return end_response('WS10M')
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
 
+# ⚡ One NASA fetch for all six parameters instead of one per parameter
+@app.route('/api/all')
+@cache.cached(query_string=True, response_filter=is_success)
+def api_all():
+    try:
+        lat, lon, target_date, start_year, end_year = get_request_params()
+        df = note_incomplete(fetch_bundle(lat, lon, target_date, start_year, end_year))
+        # Missing values are dropped per parameter, so a gap in one
+        # parameter doesn't shrink the sample for the others
+        return orjson_response({
+            p: category_probabilities(p, df[p].dropna().to_numpy())
+            for p in ALL_PARAMS
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
 
 @app.route('/api/timeseries')
+@cache.cached(query_string=True, response_filter=is_success)
 def api_timeseries():
     try:
         validate_request_params('lat', 'long', 'date')
@@ -342,11 +665,21 @@ def api_timeseries():
         target_date = request.args['date']
         start_year = int(request.args.get('start_year', 2000))
         end_year = int(request.args.get('end_year', 2025))
-        params = request.args.get('parameters', 'AOD_55_ADJ,CLOUD_AMT,T2M,SNODP,PRECTOTCORR,WS10M')
+        params = request.args.get('parameters', ','.join(ALL_PARAMS))
         parameter_list = [p.strip() for p in params.split(',')]
 
-        df = fetch_data(lat, lon, target_date, start_year, end_year, parameter_list, window=0)
-        return jsonify(df.to_dict(orient='records'))
+        if bundle_covers(parameter_list):
+            # Slice the target day out of the shared all-parameter fetch
+            target_dt, _, _ = date_window(target_date, 0)
+            bundle = note_incomplete(fetch_bundle(lat, lon, target_date, start_year, end_year))
+            on_day = (bundle['Date'].dt.month == target_dt.month) & (bundle['Date'].dt.day == target_dt.day)
+            df = bundle.loc[on_day, ['Longitude', 'Latitude', 'Elevation', 'Date', *parameter_list]]
+            df = df.dropna(subset=parameter_list)
+            if df.empty:
+                raise ValueError("No valid data returned from NASA POWER API.")
+        else:
+            df = note_incomplete(fetch_data(lat, lon, target_date, start_year, end_year, parameter_list, window=0))
+        return records_response(df)
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 